@@ -1,225 +1,447 @@
-"""
-Custom logger by me, since I'm not a fan of the standard logging module
-"""
-# TODO: Add documentation
-
-import os
-import json
-from enum import Enum
-from colorama import just_fix_windows_console
-
-__all__ = ["LoggingLevel", "Logging", "logging", "enable_logging", "disable_logging"]
-
-
-class LoggingLevel(Enum):
-    Debug = 1
-    Info = 2
-    Important = 3
-    VeryImportant = 4
-    SuperImportant = 5
-    Warning = 6
-
-
-class Logging:
-
-    def __init__(self, usedefaults: bool = True, synclog: bool = True, **kwargs) -> None:
-        """
-        :param usedefaults: Whether to use the default logging settings
-        :param synclog: Whether to sync the Log list with other instances of this class
-        :param kwargs: If usedefaults is False, supply your own logging settings here:
-            colorized=True
-            printwarnings=True
-            printdebug=False
-            printinfo=True
-            printimportant=True
-            printveryimportant=True
-            printsuperimportant=True
-            printspecial=True
-            donotprintspecial=False
-            donotprintsuccessinfo=False
-            allowoverride=True
-            printall=True
-            printnone=False
-        """
-        if usedefaults:
-            self._fromoptions(**_loadconfig())
-        else:
-            self._fromoptions(**kwargs)
-        if synclog:
-            self.Log = _Log
-        else:
-            self.Log = []
-        self.enabled = True
-
-    def _fromoptions(self,
-                     colorized=True,
-                     printwarnings=True,
-                     printdebug=False,
-                     printinfo=True,
-                     printimportant=True,
-                     printveryimportant=True,
-                     printsuperimportant=True,
-                     printspecial=True,
-                     donotprintspecial=False,
-                     donotprintsuccessinfo=False,
-                     allowoverride=True,
-                     printall=True,
-                     printnone=False
-                     ):
-        self.colorized = colorized
-        self.printwarnings = printwarnings
-        self.printdebug = printdebug
-        self.printinfo = printinfo
-        self.printimportant = printimportant
-        self.printveryimportant = printveryimportant
-        self.printsuperimportant = printsuperimportant
-        self.printspecial = printspecial
-        self.donotprintspecial = donotprintspecial
-        self.donotprintsuccessinfo = donotprintsuccessinfo
-        self.allowoverride = allowoverride
-        self.printall = printall
-        self.printnone = printnone
-
-    def enable(self):
-        self.enabled = True
-
-    def disable(self):
-        self.enabled = False
-
-    def log(self, message: str, level: LoggingLevel = LoggingLevel.Info, override: bool = False,
-            successinfo: bool = False, special: bool = False) -> None:
-        self.Log.append(message)
-        if self.printnone:
-            return
-        if not (override and self.allowoverride):
-            if successinfo and self.donotprintsuccessinfo:
-                return
-            if special and self.donotprintspecial:
-                return
-        if self.printall:
-            toprint = True
-        elif level == LoggingLevel.Debug and self.printdebug:
-            toprint = True
-        elif level == LoggingLevel.Info and self.printinfo:
-            toprint = True
-        elif level == LoggingLevel.Important and self.printimportant:
-            toprint = True
-        elif level == LoggingLevel.VeryImportant and self.printveryimportant:
-            toprint = True
-        elif level == LoggingLevel.SuperImportant and self.printsuperimportant:
-            toprint = True
-        elif special and self.printspecial:
-            toprint = True
-        else:
-            toprint = False
-        if toprint and _enabled and self.enabled:
-            self.printmessage(message, level, special, self.colorized)
-
-    def printlog(self):
-        print("\n".join(self.Log))
-
-    @staticmethod
-    def printmessage(message: str, level: LoggingLevel, special: bool, colorized: bool) -> None:
-        colors = {
-            "Debug": "\033[0m",
-            "Info": "\033[94m",
-            "Important": "\033[95m",
-            "VeryImportant": "\033[96m",
-            "SuperImportant": "\033[93m",
-            "Warning": "\033[91m",
-            "Special": "\033[92m",
-            "reset": "\033[0m"
-        }
-        if colorized:
-            if special:
-                print(f"{colors['Special']}[{level.name}] [Special]: {message}{colors['reset']}")
-            else:
-                if level.name in colors:
-                    print(f"{colors[level.name]}[{level.name}]: {message}{colors['reset']}")
-                else:
-                    print(f"[{level.name}]: {message}")
-        else:
-            if special:
-                print(f"[{level.name}] [Special]: {message}")
-            else:
-                print(f"[{level.name}]: {message}")
-
-    def warning(self, message: str, warningtype: BaseException = None) -> None:
-        if warningtype:
-            self.Log.append(f"[Warning]: {warningtype}: {message}")
-            if self.printwarnings and _enabled and self.enabled:
-                self.printmessage(f"{warningtype}: {message}", LoggingLevel.Warning, False, self.colorized)
-        else:
-            self.Log.append(f"[Warning]: {message}")
-            if self.printwarnings and _enabled and self.enabled:
-                self.printmessage(message, LoggingLevel.Warning, False, self.colorized)
-
-
-def disable_logging() -> None:
-    """
-    Disables logging to console with print statements
-    """
-    global _enabled
-    _enabled = False
-
-
-def enable_logging() -> None:
-    """
-    Enables logging to console with print statements
-    """
-    global _enabled
-    _enabled = True
-
-
-def _loadconfig() -> dict:
-    if os.path.exists(configpath):
-        with open(configpath, "r") as f:
-            return json.load(f)
-    else:
-        """
-        loggingconfig.json does not exist, fall back to hardcoded defaults
-        """
-        return _defaults
-
-
-def _writeconfig(config: dict) -> None:
-    with open(configpath, "w") as f:
-        json.dump(config, f, indent=4)
-
-
-def _config(**kwargs) -> dict:
-    """
-    This is a neat trick that lets me generate a dictionary with my config just by calling
-    this function with the options as arguments!
-    """
-    return kwargs
-
-
-_defaults = _config(colorized=True,
-                    printwarnings=True,
-                    printdebug=False,
-                    printinfo=True,
-                    printimportant=True,
-                    printveryimportant=True,
-                    printsuperimportant=True,
-                    printspecial=True,
-                    donotprintspecial=False,
-                    donotprintsuccessinfo=False,
-                    allowoverride=True,
-                    printall=True,
-                    printnone=False
-                    )
-configpath = os.path.join(os.path.dirname(__file__), "loggingconfig.json")
-just_fix_windows_console()
-_enabled = True
-
-_Log = []
-logging = Logging(usedefaults=True)
-
-if __name__ == "__main__":
-    if not os.path.exists(configpath):
-        try:
-            _writeconfig(_defaults)
-            print(f"Created loggingconfig.json at {configpath}")
-        except Exception as e:
-            print(f"Failed to create loggingconfig.json at {configpath}: {e}")
+"""
+Custom logger by me, since I'm not a fan of the standard logging module
+"""
+# TODO: Add documentation
+
+import os
+import sys
+import json
+import atexit
+import queue
+import threading
+from collections import deque
+from typing import Callable, Union
+from enum import IntEnum
+
+__all__ = ["LoggingLevel", "Logging", "logging", "log", "info", "warn",
+           "enable_logging", "disable_logging", "flush_logs",
+           "DEBUG", "INFO", "IMPORTANT", "VERYIMPORTANT", "SUPERIMPORTANT", "WARNING"]
+
+
+class LoggingLevel(IntEnum):
+    Debug = 1
+    Info = 2
+    Important = 3
+    VeryImportant = 4
+    SuperImportant = 5
+    Warning = 6
+
+
+# Plain int aliases for the LoggingLevel values. LoggingLevel is an IntEnum, so members
+# compare, shift and index exactly like these ints - hot paths use whichever form the
+# caller passed without any conversion. Either form is accepted everywhere.
+DEBUG, INFO, IMPORTANT, VERYIMPORTANT, SUPERIMPORTANT, WARNING = 1, 2, 3, 4, 5, 6
+_LEVEL_NAMES = ("", "Debug", "Info", "Important", "VeryImportant", "SuperImportant", "Warning")
+
+# Bit used in Logging._print_mask for special messages (level values use bits 1-6)
+_SPECIAL_BIT = 7
+
+# ANSI color codes, built once at module level instead of on every printmessage() call
+_LEVEL_COLORS = {
+    "Debug": "\033[0m",
+    "Info": "\033[94m",
+    "Important": "\033[95m",
+    "VeryImportant": "\033[96m",
+    "SuperImportant": "\033[93m",
+    "Warning": "\033[91m",
+}
+_SPECIAL_COLOR = "\033[92m"
+_RESET = "\033[0m"
+
+# Messages are handed to a background writer thread through a queue, so the logging caller
+# never blocks on terminal I/O. The writer drains bursts of up to _FLUSH_BATCH messages
+# and writes them to stdout in a single write.
+_FLUSH_BATCH = 128
+_log_q = queue.SimpleQueue()
+
+
+def _write_line(line: bytes, urgent: bool = False) -> None:
+    _log_q.put(line)
+    if urgent:
+        flush_logs()
+
+
+def flush_logs() -> None:
+    """
+    Blocks until every message queued so far has been written to stdout
+    """
+    done = threading.Event()
+    _log_q.put(done)
+    # Timeout so we can't hang forever if the writer thread died at interpreter shutdown
+    done.wait(timeout=1)
+
+
+def _writer_loop() -> None:
+    while True:
+        items = [_log_q.get()]
+        try:
+            while len(items) < _FLUSH_BATCH:
+                items.append(_log_q.get_nowait())
+        except queue.Empty:
+            pass
+        batch = [item for item in items if isinstance(item, bytes)]
+        if batch:
+            data = b"".join(batch)
+            try:
+                # Write pre-encoded bytes straight to the binary layer, skipping the
+                # TextIOWrapper re-encode of every line
+                sys.stdout.buffer.write(data)
+                sys.stdout.buffer.flush()
+            except AttributeError:
+                # stdout was swapped for a text-only stream (redirect_stdout to a
+                # StringIO, some IDE consoles) - fall back to the text layer
+                try:
+                    sys.stdout.write(data.decode("utf-8", "replace"))
+                    sys.stdout.flush()
+                except Exception:
+                    pass
+            except Exception:
+                # A broken stdout must never kill the writer thread - drop the batch;
+                # the sentinels below still get set so flush_logs() callers don't stall
+                pass
+        for item in items:
+            # Anything that isn't a message is a flush_logs() sentinel to signal
+            if not isinstance(item, bytes):
+                item.set()
+
+
+class Logging:
+    # Slots instead of a per-instance __dict__: the many attribute reads in log() become
+    # C-level slot loads and each instance is a couple hundred bytes smaller
+    __slots__ = ("colorized", "printwarnings", "printdebug", "printinfo", "printimportant",
+                 "printveryimportant", "printsuperimportant", "printspecial", "donotprintspecial",
+                 "donotprintsuccessinfo", "allowoverride", "printall", "printnone", "retain_log",
+                 "log_capacity",
+                 "Log", "enabled", "_print_mask", "_special_enabled", "_prefix_colored",
+                 "_prefix_plain", "_prefix_special_colored", "_prefix_special_plain",
+                 "_suffix_colored", "_emit_color", "info")
+
+    def __init__(self, usedefaults: bool = True, synclog: bool = True, **kwargs) -> None:
+        """
+        :param usedefaults: Whether to use the default logging settings
+        :param synclog: Whether to sync the Log list with other instances of this class
+        :param kwargs: If usedefaults is False, supply your own logging settings here:
+            colorized=True
+            printwarnings=True
+            printdebug=False
+            printinfo=True
+            printimportant=True
+            printveryimportant=True
+            printsuperimportant=True
+            printspecial=True
+            donotprintspecial=False
+            donotprintsuccessinfo=False
+            allowoverride=True
+            printall=True
+            printnone=False
+            retain_log=False
+            log_capacity=10000
+        """
+        if usedefaults:
+            self._fromoptions(**_loadconfig())
+        else:
+            self._fromoptions(**kwargs)
+        if synclog:
+            self.Log = _Log
+        else:
+            self.Log = deque(maxlen=self.log_capacity)
+        self.enabled = True
+
+    def _fromoptions(self,
+                     colorized=True,
+                     printwarnings=True,
+                     printdebug=False,
+                     printinfo=True,
+                     printimportant=True,
+                     printveryimportant=True,
+                     printsuperimportant=True,
+                     printspecial=True,
+                     donotprintspecial=False,
+                     donotprintsuccessinfo=False,
+                     allowoverride=True,
+                     printall=True,
+                     printnone=False,
+                     retain_log=False,
+                     log_capacity=10_000
+                     ):
+        self.colorized = colorized
+        self.printwarnings = printwarnings
+        self.printdebug = printdebug
+        self.printinfo = printinfo
+        self.printimportant = printimportant
+        self.printveryimportant = printveryimportant
+        self.printsuperimportant = printsuperimportant
+        self.printspecial = printspecial
+        self.donotprintspecial = donotprintspecial
+        self.donotprintsuccessinfo = donotprintsuccessinfo
+        self.allowoverride = allowoverride
+        self.printall = printall
+        self.printnone = printnone
+        self.retain_log = retain_log
+        self.log_capacity = log_capacity
+        # Cache the level gating into a bitmask so is_enabled() is just a shift and a compare
+        # instead of rerunning the whole if/elif ladder
+        mask = 0
+        if not printnone:
+            if printall:
+                for level in LoggingLevel:
+                    mask |= 1 << level
+                mask |= 1 << _SPECIAL_BIT
+            else:
+                if printdebug:
+                    mask |= 1 << LoggingLevel.Debug
+                if printinfo:
+                    mask |= 1 << LoggingLevel.Info
+                if printimportant:
+                    mask |= 1 << LoggingLevel.Important
+                if printveryimportant:
+                    mask |= 1 << LoggingLevel.VeryImportant
+                if printsuperimportant:
+                    mask |= 1 << LoggingLevel.SuperImportant
+                if printspecial:
+                    mask |= 1 << _SPECIAL_BIT
+        self._print_mask = mask
+        self._special_enabled = (mask >> _SPECIAL_BIT) & 1
+        # Preformatted, pre-encoded "<color>[Name]: " prefixes indexed by LoggingLevel.value,
+        # so emitting a message is one bytes concatenation instead of an f-string that
+        # interpolates color codes and the Enum name (plus a UTF-8 re-encode) on every call
+        self._prefix_colored = [None]
+        self._prefix_plain = [None]
+        self._prefix_special_colored = [None]
+        self._prefix_special_plain = [None]
+        for level in LoggingLevel:
+            self._prefix_colored.append(f"{_LEVEL_COLORS[level.name]}[{level.name}]: ".encode("utf-8"))
+            self._prefix_plain.append(f"[{level.name}]: ".encode("utf-8"))
+            self._prefix_special_colored.append(f"{_SPECIAL_COLOR}[{level.name}] [Special]: ".encode("utf-8"))
+            self._prefix_special_plain.append(f"[{level.name}] [Special]: ".encode("utf-8"))
+        self._suffix_colored = (_RESET + "\n").encode("utf-8")
+        # Only emit ANSI codes when stdout is actually a terminal; the escapes are wasted
+        # bytes when output is redirected to a file or pipe
+        self._emit_color = colorized and sys.stdout.isatty()
+        self.info = self._make_info_fast()
+
+    def _make_info_fast(self) -> Callable[[str], None]:
+        """
+        Builds a specialized logger for the common Info level: everything log() would
+        compute for an Info message is captured here once, leaving only the enabled
+        checks and one bytes concatenation per call. Use as logging.info(message).
+        """
+        enabled_bit = (self._print_mask >> INFO) & 1
+        if self._emit_color:
+            prefix = self._prefix_colored[INFO]
+            suffix = self._suffix_colored
+        else:
+            prefix = self._prefix_plain[INFO]
+            suffix = b"\n"
+        retain = self.retain_log
+        put = _log_q.put
+
+        def info(message: str) -> None:
+            if retain:
+                self.Log.append(message)
+            if enabled_bit and _enabled_box[0] and self.enabled:
+                put(prefix + message.encode("utf-8", "replace") + suffix)
+
+        return info
+
+    def is_enabled(self, level: Union[LoggingLevel, int] = INFO, special: bool = False,
+                   successinfo: bool = False, override: bool = False) -> bool:
+        """
+        Cheap check for whether a message with these settings would be printed, so callers can
+        skip building expensive log messages entirely:
+            if logging.is_enabled(LoggingLevel.Info):
+                logging.log(f"...")
+        """
+        if not (_enabled_box[0] and self.enabled):
+            return False
+        if not (override and self.allowoverride):
+            if successinfo and self.donotprintsuccessinfo:
+                return False
+            if special and self.donotprintspecial:
+                return False
+        if (self._print_mask >> level) & 1:
+            return True
+        return bool(special and (self._print_mask >> _SPECIAL_BIT) & 1)
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def log(self, message: Union[str, Callable[[], str]], level: Union[LoggingLevel, int] = INFO,
+            override: bool = False, successinfo: bool = False, special: bool = False) -> None:
+        # Fast path when logging is globally or per-instance disabled: nothing will print,
+        # so skip all the gating work (the retained log still gets its entry if it is on)
+        if not (_enabled_box[0] and self.enabled) or self.printnone:
+            if self.retain_log:
+                if callable(message):
+                    message = message()
+                self.Log.append(message)
+            return
+        if callable(message):
+            # Lazy form: only build the message if it would actually get printed - or
+            # retained, since retention must not depend on how the message was passed
+            if not self.is_enabled(level, special=special, successinfo=successinfo, override=override):
+                if self.retain_log:
+                    self.Log.append(message())
+                return
+            message = message()
+        if self.retain_log:
+            self.Log.append(message)
+        if not (override and self.allowoverride):
+            if successinfo and self.donotprintsuccessinfo:
+                return
+            if special and self.donotprintspecial:
+                return
+        # One shift + and covers printall/printnone and every per-level flag
+        if not ((self._print_mask >> level) & 1 or (special and self._special_enabled)):
+            return
+        self._emit(message, level, special)
+
+    def printlog(self):
+        print("\n".join(self.Log))
+
+    def get_log(self) -> list:
+        """
+        Returns the log as a plain list (self.Log is a bounded deque)
+        """
+        return list(self.Log)
+
+    def _emit(self, message: str, level: Union[LoggingLevel, int], special: bool) -> None:
+        if self._emit_color:
+            prefix = (self._prefix_special_colored if special else self._prefix_colored)[level]
+            line = prefix + message.encode("utf-8", "replace") + self._suffix_colored
+        else:
+            prefix = (self._prefix_special_plain if special else self._prefix_plain)[level]
+            line = prefix + message.encode("utf-8", "replace") + b"\n"
+        # Warnings are flushed immediately; everything else is batched
+        _write_line(line, urgent=level == WARNING)
+
+    @staticmethod
+    def printmessage(message: str, level: Union[LoggingLevel, int], special: bool = False,
+                     colorized: bool = True) -> None:
+        """
+        Old public entry point, kept with its original
+        (message, level, special, colorized) signature. colorized is accepted but
+        ignored - whether color is emitted is decided per instance now - and the
+        message goes out through the default instance
+        """
+        logging._emit(message, level, special)
+
+    def warning(self, message: str, warningtype: BaseException = None) -> None:
+        text = f"{warningtype}: {message}" if warningtype else message
+        if self.retain_log:
+            self.Log.append(f"[Warning]: {text}")
+        if self.printwarnings and _enabled_box[0] and self.enabled:
+            self._emit(text, WARNING, False)
+
+
+def disable_logging() -> None:
+    """
+    Disables logging to console with print statements
+    """
+    _enabled_box[0] = False
+
+
+def enable_logging() -> None:
+    """
+    Enables logging to console with print statements
+    """
+    _enabled_box[0] = True
+
+
+def _loadconfig() -> dict:
+    # Cached so constructing many Logging instances only reads and parses the file once.
+    # Opening directly and catching FileNotFoundError also saves the separate
+    # os.path.exists() check (and its race condition).
+    global _config_cache
+    if _config_cache is None:
+        try:
+            with open(configpath, "r") as f:
+                # Merge over the defaults so a config file with missing keys still works
+                _config_cache = {**_defaults, **json.load(f)}
+        except FileNotFoundError:
+            # loggingconfig.json does not exist, fall back to hardcoded defaults
+            _config_cache = _defaults
+    return _config_cache
+
+
+def _writeconfig(config: dict, pretty: bool = False) -> None:
+    global _config_cache
+    # Skip the serialize + write entirely if the file already holds this exact config
+    try:
+        with open(configpath, "r") as f:
+            if json.load(f) == config:
+                return
+    except (FileNotFoundError, json.JSONDecodeError):
+        pass
+    # Write to a temp file and os.replace() it into place so a crash mid-write can't
+    # leave a corrupt loggingconfig.json behind
+    tmppath = configpath + ".tmp"
+    with open(tmppath, "w") as f:
+        if pretty:
+            json.dump(config, f, indent=4)
+        else:
+            json.dump(config, f, separators=(",", ":"))
+    os.replace(tmppath, configpath)
+    _config_cache = None
+
+
+def _config(**kwargs) -> dict:
+    """
+    This is a neat trick that lets me generate a dictionary with my config just by calling
+    this function with the options as arguments!
+    """
+    return kwargs
+
+
+_defaults = _config(colorized=True,
+                    printwarnings=True,
+                    printdebug=False,
+                    printinfo=True,
+                    printimportant=True,
+                    printveryimportant=True,
+                    printsuperimportant=True,
+                    printspecial=True,
+                    donotprintspecial=False,
+                    donotprintsuccessinfo=False,
+                    allowoverride=True,
+                    printall=True,
+                    printnone=False,
+                    retain_log=False,
+                    log_capacity=10_000
+                    )
+configpath = os.path.join(os.path.dirname(__file__), "loggingconfig.json")
+_config_cache = None
+# One-element list instead of a rebindable global, so readers index a stable object
+# rather than doing a module-globals lookup guarded by the `global` statement
+_enabled_box = [True]
+# Only needed when we will actually write ANSI codes to a Windows console; importing
+# colorama lazily here means the majority platforms never pay its import cost at all
+if os.name == "nt" and sys.stdout.isatty():
+    from colorama import just_fix_windows_console
+    just_fix_windows_console()
+
+_writer_thread = threading.Thread(target=_writer_loop, daemon=True)
+_writer_thread.start()
+atexit.register(flush_logs)
+
+# Bounded so a long-running process can't leak memory through the log
+_Log = deque(maxlen=10_000)
+logging = Logging(usedefaults=True)
+
+# Aliases for the default instance so hot call sites skip the instance attribute lookup.
+# Note these stay bound to this instance even if you rebind `logging` with your own.
+log = logging.log
+info = logging.info
+warn = logging.warning
+
+if __name__ == "__main__":
+    if not os.path.exists(configpath):
+        try:
+            # Pretty-printed since this file is meant to be edited by hand
+            _writeconfig(_defaults, pretty=True)
+            print(f"Created loggingconfig.json at {configpath}")
+        except Exception as e:
+            print(f"Failed to create loggingconfig.json at {configpath}: {e}")
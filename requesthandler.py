@@ -1,367 +1,764 @@
-"""
-Helper class for making HTTP requests
-Only supports get and post requests
-"""
-
-from typing import Set, Dict, Any, Union, Optional, Sequence
-from collections import OrderedDict
-import requests
-
-# Don't import logging; we make our own instance
-from src.logger import Logging, LoggingLevel
-
-__all__ = ["RequestHandler", "HTTPError", "NoInternetError", "Logging", "logging", "enable_logging", "disable_logging"]
-
-
-def _list_items(items: Union[Sequence[str], Set[str]]) -> str:
-    """
-    Helper function to convert a list of items to a grammatically correct string
-    """
-    if not isinstance(items, (tuple, list)):
-        logging.log(f"_list_items() function called on object of type {type(items).__name__}"
-                    f", which is unordered. Converting to a tuple to make it ordered.",
-                    LoggingLevel.Debug)
-        items = tuple(items)
-    if len(items) == 1:
-        return str(items[0])
-    elif len(items) == 2:
-        return str(items[0]) + " and " + str(items[1])
-    else:
-        result = ""
-        for i in range(len(items) - 1):
-            result += str(items[i]) + ", "
-        result += "and " + str(items[-1])
-        return result
-
-
-def _truncatestring(s: str, maxlength: Optional[int] = 1000, maxlines: Optional[int] = 20) -> str:
-    """
-    Helper function to truncate a string to a given length
-
-    :param s: The initial string
-    :param maxlength: The amount of characters to truncate at. Takes precedence over maxlines.
-    :param maxlines: The amount of lines to truncate at. Lower precedence than maxlength.
-    :return: If the string did not exceed either of the limits - the unmodified initial string
-             If the string exceeded the length limit - the string truncated to the length limit with
-             "...[Truncated]" added to the end
-             If the string exceeded the line limit but not the length limit - the string truncated to the
-             line limit with "...[Truncated]" added to the end
-    """
-    if maxlength and len(s) > maxlength:
-        return s[0:maxlength - 1] + "...[Truncated]"
-    lines = s.splitlines()
-    if maxlines and len(lines) > maxlines:
-        return "\n".join(lines[0:maxlines - 1]) + "...[Truncated]"
-    return s
-
-
-def _truncatedict(d: Union[Dict, OrderedDict], maxitems: Optional[int] = 10,
-                  maxlengthperitem: Optional[int] = 50, maxlinesperitem: Optional[int] = 1) -> str:
-    """
-    Helper function to truncate a dictionary to a given length
-    Converts all the items to strings in "key: value" format, truncates each item
-    truncates items to maxitems, then constructs string representation of dictionary from new items
-
-    Warning: Python does not guarantee the order of dictionaries, so if you want some keys to be
-        less likely to be truncated than others, use an OrderedDict rather than a standard dictionary
-        and make sure you keep the items in order of importance.
-
-    :param d: The initial dictionary
-    :param maxitems: The maximum amount of items to include in the final string. Any items beyond this
-        limit will be truncated.
-    :param maxlengthperitem: The amount of characters to truncate each item at,
-        including both the key and value. Takes precedence over maxlines.
-    :param maxlinesperitem: The amount of lines to truncate each item at,
-        including both the key and value. Lower precedence than maxlength.
-    :return: For each item:
-                Converts item to string in "key: value" format
-                If the item string exceeds the per item length limit - the item string truncated to the
-                length limit with "...[Truncated]" added to the end
-                If the item string exceeds the per item line limit but not the per item length limit -
-                the item string truncated to the line limit with "...[Truncated]" added to the end
-            Removes any items beyond maxitems.
-            Constructs string representation of dictionary from new items
-            If maxitems was exceeded and some items were removed, adds "...[Truncated Items]" to the end
-            of the string representation
-    """
-    items = [_truncatestring(f"{key}: {value}", maxlengthperitem, maxlinesperitem) for key, value in d.items()]
-    hastruncateditems = False
-    if maxitems and len(items) > maxitems:
-        hastruncateditems = True
-        items = items[:maxitems]
-    dictstring = "{" + " ".join([f"{item}," if i < len(items) - 1 else item for i, item in enumerate(items)]) + "}"
-    if hastruncateditems:
-        dictstring += "...[Truncated Items]"
-    return dictstring
-
-
-class HTTPError(Exception):
-    """
-    Exception raised for errors related to HTTP requests
-    """
-    pass
-
-
-class NoInternetError(HTTPError):
-    """
-    Exception raised if there is no internet connection
-    """
-    pass
-
-
-class RequestHandler:
-    """
-    Helper class for making http requests
-    """
-
-    @staticmethod
-    def get(link: str, params: Dict = None, auth: Any = None, cache: bool = True,
-            headers: Dict = None, timeout: float = 5, errormessage: str = None,
-            exceptionifbadstatuscode: bool = True) -> requests.Response:
-        """
-        Helper function to make http get request
-        If request fails, returns (None, None) or raises exception
-
-        :param link: Link to make get request to
-        :param params: Parameters to include in get request
-        :param cache: Whether to allow requests to be cached.
-                If cache is False, the header {'Cache-Control': 'no-cache'}
-                will be included in the request to disable caching.
-                If cache is True, the Cache-Control header will not be included at all.
-                Warning: If cache is True, it is not guaranteed that the request will be cached,
-                but it should be.
-                This will not override the headers parameter if it contains a 'Cache-Control' header.
-        :param auth: Authorization to include in the request.
-            This will not override the headers parameter if it contains an 'Authorization' header.
-        :param headers: Headers to include in get request
-        :param timeout: How many seconds to wait until timing out the request
-        :param errormessage: Error message to raise if request fails or returns a
-            non-200 HTTP status code.
-            This will be bolted on to the beginning of the original error message.
-        :param exceptionifbadstatuscode: Whether to raise an exception if the request returns a non-200
-            status code
-        :return: response
-
-        :raises NoInternetError: No internet connection
-        :raises HttpError: Request failed
-        :raise HttpError: Request returned a non-200 HTTP status code and exceptionifbadstatuscode was True
-        """
-        if timeout <= 0:
-            timeout = None
-        if headers is None:
-            headers = {}
-        if auth and 'Authorization' not in headers:
-            headers['Authorization'] = auth
-        if not cache and 'Cache-Control' not in headers:
-            headers['Cache-Control'] = 'no-cache'
-        logmessage = f"Making HTTP get request to {link}"
-        requestdatamessage = []
-        if params:
-            requestdatamessage.append("params"
-                                      f" {_truncatedict(params, maxitems=3, maxlengthperitem=45, maxlinesperitem=1)}")
-        if headers:
-            requestdatamessage.append(
-                f"headers {_truncatedict(headers, maxitems=3, maxlengthperitem=45, maxlinesperitem=1)}")
-        if requestdatamessage:
-            logmessage += f" with {_list_items(requestdatamessage)}"
-        if timeout:
-            logmessage += f" with timeout of {timeout} seconds..."
-        logging.log(logmessage, LoggingLevel.Info)
-        try:
-            response = requests.get(link, params=params, headers=headers, timeout=timeout)
-        except requests.ConnectionError as e:
-            # noinspection IncorrectFormatting
-            if "An existing connection was forcibly closed by the remote host" in str(e):
-                if errormessage:
-                    raise HTTPError(f"{errormessage}: HTTP get request to {link} failed - Connection forcibly closed"
-                                    f" by remote host") from None
-                else:
-                    raise HTTPError(f"HTTP get request to {link} failed - Connection forcibly closed"
-                                    f" by remote host") from None
-            else:
-                if errormessage:
-                    raise HTTPError(f"{errormessage}: HTTP get request to {link} failed - {e}") from None
-                else:
-                    raise HTTPError(f"HTTP get request to {link} failed - {e}") from None
-        except Exception as e:
-            if errormessage:
-                raise HTTPError(f"{errormessage}: HTTP get request to {link} failed - {e}") from None
-            else:
-                raise HTTPError(f"HTTP get request to {link} failed - {e}") from None
-        if 200 <= response.status_code < 300:
-            logging.log(f"Successfully made HTTP get request to {link}", LoggingLevel.Info, successinfo=True)
-        else:
-            if exceptionifbadstatuscode:
-                if errormessage:
-                    raise HTTPError(f"{errormessage}: HTTP get request to {link} failed"
-                                    f" - returned non-200 http status code ({response.status_code})")
-                else:
-                    raise HTTPError(f"HTTP get request to {link} failed"
-                                    f" - returned non-200 http status code ({response.status_code})")
-            else:
-                logging.log(f"HTTP get request to {link} failed"
-                            f" - returned non-200 http status code ({response.status_code})",
-                            LoggingLevel.Info, successinfo=True)
-        return response
-
-    @staticmethod
-    def post(link: str, data: Any = None, contenttype: str = None, json: Dict = None,
-             auth: Any = None, headers: Dict = None, timeout: float = 5, errormessage: str = None,
-             exceptionifbadstatuscode: bool = True) -> requests.Response:
-        """
-        Helper function to make http post request
-        If request fails, returns (None, None) or raises exception
-
-        :param link: Link to make post request to
-        :param data: Body of post request. For an empty body, set it to None or don't supply anything for it.
-            Make sure contenttype matches the type of this data.
-        :param contenttype: The content type of the data, like 'text/plain' or 'application/json'.
-            Automatically detects json and string. If body is empty, contenttype will not be used.
-            This will not override the headers parameter if it contains a 'Content-Type' header.
-        :param json: Json data to include in the post request.
-        :param auth: Authorization to include in the request.
-            This will not override the headers parameter if it contains an 'Authorization' header.
-        :param headers: Headers to include in post request.
-        :param timeout: How many seconds to wait until timing out the request
-        :param errormessage: Error message to raise if request fails or returns a
-            non-200 HTTP status code.
-            This will be bolted on to the beginning of the original error message.
-        :param exceptionifbadstatuscode: Whether to raise an exception if the request returns a non-200
-            status code
-        :return: response
-
-        :raises ValueError: contenttype parameter was not supplied, 'Content-Type' header was not supplied,
-            and content type could not be automatically detected.
-        :raises NoInternetError: No internet connection
-        :raises HttpError: Request failed
-        :raise HttpError: Request returned a non-200 HTTP status code and exceptionifbadstatuscode was True
-        """
-        if timeout <= 0:
-            timeout = None
-        if headers is None:
-            headers = {}
-        if data is not None and 'Content-Type' not in headers:
-            if not contenttype:
-                if isinstance(data, str):
-                    contenttype = "text/plain"
-                elif isinstance(data, dict):
-                    contenttype = "application/json"
-                else:
-                    raise ValueError(f"Failed to make http post request to {link}: Could not determine content type of"
-                                     f" data, which is of type {type(data).__name__}. Please manually"
-                                     f" supply the content type using the contenttype parameter.")
-                logging.log("Automatically detected content type of data"
-                            f" \"{_truncatestring(str(data), maxlength=100, maxlines=1)}\": {contenttype}")
-            headers["Content-Type"] = contenttype
-        if auth and 'Authorization' not in headers:
-            headers['Authorization'] = auth
-        logmessage = f"Making HTTP post request to {link}"
-        requestdatamessage = []
-        if data is not None:
-            requestdatamessage.append(f"data \"{_truncatestring(str(data), maxlength=100, maxlines=1)}\""
-                                      f" of content type {headers['Content-Type']}")
-        else:
-            requestdatamessage.append("empty body")
-        if json:
-            requestdatamessage.append(f"json {_truncatedict(json, maxitems=3, maxlengthperitem=45, maxlinesperitem=1)}")
-        if headers:
-            requestdatamessage.append(
-                f"headers {_truncatedict(headers, maxitems=3, maxlengthperitem=45, maxlinesperitem=1)}")
-        if requestdatamessage:
-            logmessage += f" with {_list_items(requestdatamessage)}"
-        if timeout:
-            logmessage += f" with timeout of {timeout} seconds..."
-        logging.log(logmessage, LoggingLevel.Info)
-        try:
-            response = requests.post(link, json=json, headers=headers, timeout=timeout)
-        except requests.ConnectionError as e:
-            # noinspection IncorrectFormatting
-            if "An existing connection was forcibly closed by the remote host" in str(e):
-                if errormessage:
-                    raise HTTPError(f"{errormessage}: HTTP get request to {link} failed - Connection forcibly closed"
-                                    f" by remote host") from None
-                else:
-                    raise HTTPError(f"HTTP get request to {link} failed - Connection forcibly closed"
-                                    f" by remote host") from None
-            else:
-                if errormessage:
-                    raise HTTPError(f"{errormessage}: HTTP post request to {link} failed - {e}") from None
-                else:
-                    raise HTTPError(f"HTTP post request to {link} failed - {e}") from None
-        except Exception as e:
-            if errormessage:
-                raise HTTPError(f"{errormessage}: HTTP post request to {link} failed - {e}") from None
-            else:
-                raise HTTPError(f"HTTP post request to {link} failed - {e}") from None
-        if if 200 <= response.status_code < 300:
-            logging.log(f"Successfully made HTTP post request to {link}", LoggingLevel.Info, successinfo=True)
-        else:
-            if exceptionifbadstatuscode:
-                if errormessage:
-                    raise HTTPError(f"{errormessage}: HTTP get request to {link} failed"
-                                    f" - returned non-200 http status code ({response.status_code})")
-                else:
-                    raise HTTPError(f"HTTP post request to {link} failed"
-                                    f" - returned non-200 http status code ({response.status_code})")
-            else:
-                logging.log(f"HTTP post request to {link} failed"
-                            f" - returned non-200 http status code ({response.status_code})",
-                            LoggingLevel.Info, successinfo=True)
-        return response
-
-    @staticmethod
-    def check_internet(testurl: str = "https://www.example.com", timeout: float = 5) -> bool:
-        """
-        Checks that there is an internet connection.
-
-        :param testurl: URL to make request to
-        :param timeout: Timeout for request. If the timeout is exceeded, the internet connection check will fail.
-        :return: Whether there is an internet connection
-        """
-        if timeout:
-            logging.log(f"Checking for internet connection with timeout of {timeout} seconds...",
-                        LoggingLevel.Info)
-        else:
-            logging.log("Checking for internet connection...", LoggingLevel.Info)
-        logging.log(f"Using {testurl} to check for internet connection", LoggingLevel.Debug)
-        try:
-            RequestHandler.get(testurl, timeout=timeout, errormessage="Failed to check for internet connection")
-        except NoInternetError:
-            return False
-        else:
-            logging.log(f"Successfully confirmed internet connection!", LoggingLevel.Info, successinfo=True)
-            return True
-
-    @classmethod
-    def assert_internet(cls, testurl: str = "https://www.example.com", timeout: float = 5) -> None:
-        """
-        Asserts that there is an internet connection.
-
-        :param testurl: URL to make request to
-        :param timeout: Timeout for request. If the timeout is exceeded, the internet connection check will fail.
-
-        :raises NoInternetError: No internet connection
-        """
-        if not cls.check_internet(testurl, timeout):
-            raise NoInternetError("No internet connection")
-
-
-# Make our own instance of logging
-logging = Logging(usedefaults=True)
-
-
-def enable_logging():
-    """
-    Enables logging to the console with print statements
-    """
-    logging.enable()
-
-
-def disable_logging():
-    """
-    Enables logging to the console with print statements
-    """
-    logging.disable()
-
-
-disable_logging()
+"""
+Helper class for making HTTP requests
+Only supports get and post requests
+"""
+
+import asyncio
+import functools
+# Aliased because post() has a json parameter that shadows the module name
+import json as _json
+import re
+import socket
+import sys
+import time
+import threading
+import email.utils
+from datetime import datetime, timezone
+from typing import Set, Dict, Any, Union, Optional, Sequence
+from collections import OrderedDict
+from itertools import islice
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Don't import logging; we make our own instance
+from src.logger import Logging, LoggingLevel
+
+__all__ = ["RequestHandler", "HTTPError", "NoInternetError", "Logging", "logging", "enable_logging", "disable_logging"]
+
+
+def _list_items(items: Union[Sequence[str], Set[str]]) -> str:
+    """
+    Helper function to convert a list of items to a grammatically correct string
+    """
+    if not isinstance(items, (tuple, list)):
+        if logging.is_enabled(LoggingLevel.Debug):
+            logging.log(f"_list_items() function called on object of type {type(items).__name__}"
+                        f", which is unordered. Converting to a tuple to make it ordered.",
+                        LoggingLevel.Debug)
+        items = tuple(items)
+    if len(items) == 0:
+        return ""
+    elif len(items) == 1:
+        return str(items[0])
+    elif len(items) == 2:
+        return str(items[0]) + " and " + str(items[1])
+    else:
+        # Single join instead of quadratic += string building
+        return ", ".join(map(str, items[:-1])) + ", and " + str(items[-1])
+
+
+def _truncatestring(s: str, maxlength: Optional[int] = 1000, maxlines: Optional[int] = 20) -> str:
+    """
+    Helper function to truncate a string to a given length
+
+    :param s: The initial string
+    :param maxlength: The amount of characters to truncate at. Takes precedence over maxlines.
+    :param maxlines: The amount of lines to truncate at. Lower precedence than maxlength.
+    :return: If the string did not exceed either of the limits - the unmodified initial string
+             If the string exceeded the length limit - the string truncated to the length limit with
+             "...[Truncated]" added to the end
+             If the string exceeded the line limit but not the length limit - the string truncated to the
+             line limit with "...[Truncated]" added to the end
+    """
+    if maxlength and len(s) > maxlength:
+        return s[0:maxlength - 1] + "...[Truncated]"
+    if maxlines:
+        if maxlines == 1:
+            # By far the most common call (every dict item goes through here) - a single
+            # find() instead of counting every newline in the string
+            nl = s.find("\n")
+            if nl == -1 or nl == len(s) - 1:
+                # Zero or one newline at the very end - still a single line
+                return s
+            return s[:nl] + "...[Truncated]"
+        # Count newlines with one C-level scan; only find the cut point when actually
+        # truncating, instead of always allocating a list of every line
+        nlines = s.count("\n") + (0 if s.endswith("\n") else 1)
+        if nlines > maxlines:
+            idx = 0
+            for _ in range(maxlines - 1):
+                idx = s.index("\n", idx) + 1
+            return s[:idx - 1] + "...[Truncated]"
+    return s
+
+
+def _truncatedict(d: Dict, maxitems: Optional[int] = 10,
+                  maxlengthperitem: Optional[int] = 50, maxlinesperitem: Optional[int] = 1) -> str:
+    """
+    Helper function to truncate a dictionary to a given length
+    Converts all the items to strings in "key: value" format, truncates each item
+    truncates items to maxitems, then constructs string representation of dictionary from new items
+
+    Note: dictionaries keep insertion order (guaranteed since Python 3.7), so if you want some keys
+        to be less likely to be truncated than others, just insert them first - no need for an
+        OrderedDict.
+
+    :param d: The initial dictionary
+    :param maxitems: The maximum amount of items to include in the final string. Any items beyond this
+        limit will be truncated.
+    :param maxlengthperitem: The amount of characters to truncate each item at,
+        including both the key and value. Takes precedence over maxlines.
+    :param maxlinesperitem: The amount of lines to truncate each item at,
+        including both the key and value. Lower precedence than maxlength.
+    :return: For each item:
+                Converts item to string in "key: value" format
+                If the item string exceeds the per item length limit - the item string truncated to the
+                length limit with "...[Truncated]" added to the end
+                If the item string exceeds the per item line limit but not the per item length limit -
+                the item string truncated to the line limit with "...[Truncated]" added to the end
+            Removes any items beyond maxitems.
+            Constructs string representation of dictionary from new items
+            If maxitems was exceeded and some items were removed, adds "...[Truncated Items]" to the end
+            of the string representation
+    """
+    hastruncateditems = bool(maxitems) and len(d) > maxitems
+    # Cap the iteration up front so dropped items are never formatted or truncated at all
+    it = islice(d.items(), maxitems) if maxitems else d.items()
+    items = [_truncatestring(f"{key}: {value}", maxlengthperitem, maxlinesperitem) for key, value in it]
+    dictstring = "{" + ", ".join(items) + "}"
+    if hastruncateditems:
+        dictstring += "...[Truncated Items]"
+    return dictstring
+
+
+class HTTPError(Exception):
+    """
+    Exception raised for errors related to HTTP requests
+    """
+    pass
+
+
+class NoInternetError(HTTPError):
+    """
+    Exception raised if there is no internet connection
+    """
+    pass
+
+
+@functools.lru_cache(maxsize=256)
+def _link_key(link: str) -> str:
+    """
+    Interns frequently-requested links so repeat requests reuse one string object
+    for log formatting and as the response cache key
+    """
+    return sys.intern(link)
+
+
+# Pulls the max-age value out of a Cache-Control header
+_MAX_AGE_RE = re.compile(r"max-age=(\d+)")
+
+# Classifies ConnectionError messages in one compiled pass instead of a substring scan
+# per known failure shape
+_CONN_ERR_RE = re.compile(
+    r"(?P<closed>An existing connection was forcibly closed by the remote host)"
+    r"|(?P<noconn>Failed to establish a new connection)",
+    re.DOTALL)
+
+
+def _raise_http(exc_type, errormessage: Optional[str], msg: str) -> None:
+    """
+    Raises exc_type from a single formatted message, bolting errormessage on to the
+    front when one was supplied. Keeps the if errormessage/else ladder in one place.
+    """
+    raise exc_type(f"{errormessage}: {msg}" if errormessage else msg) from None
+
+
+def _raise_request_failed(method: str, link: str, e: Exception, errormessage: Optional[str]) -> None:
+    """
+    Classifies a failed request's exception and raises the matching HTTPError
+    (NoInternetError when no connection could be established at all).
+    Shared by get and post so the branching and message formatting only exist once.
+    """
+    # httpx exceptions can only occur if httpx is already imported (the HTTP/2 path),
+    # so resolving it through sys.modules keeps the dependency optional
+    httpx = sys.modules.get("httpx")
+    if httpx is not None and isinstance(e, (httpx.ConnectError, httpx.ConnectTimeout)):
+        _raise_http(NoInternetError, errormessage,
+                    f"HTTP {method} request to {link} failed - could not establish a connection"
+                    " (no internet connection?)")
+    if isinstance(e, requests.ConnectionError):
+        match = _CONN_ERR_RE.search(str(e))
+        if match and match.lastgroup == "closed":
+            msg = f"HTTP {method} request to {link} failed - Connection forcibly closed by remote host"
+        elif match and match.lastgroup == "noconn":
+            _raise_http(NoInternetError, errormessage,
+                        f"HTTP {method} request to {link} failed - could not establish a connection"
+                        " (no internet connection?)")
+        else:
+            msg = f"HTTP {method} request to {link} failed - {e}"
+    else:
+        msg = f"HTTP {method} request to {link} failed - {e}"
+    _raise_http(HTTPError, errormessage, msg)
+
+
+class RequestHandler:
+    """
+    Helper class for making http requests
+    """
+
+    # In-memory LRU of cacheable get responses, keyed by (link, params).
+    # Entries are (expiry monotonic time or None, response).
+    _cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+    _cachelock = threading.Lock()
+    cachemaxsize = 128
+
+    # Shared session so repeated requests reuse pooled connections (TCP keep-alive and
+    # TLS session reuse) instead of doing a fresh handshake per call
+    _session: Optional[requests.Session] = None
+
+    # Transient failures (connection resets, 502/503/504) are retried with exponential
+    # backoff before surfacing as HTTPError; use configure_retry() to change or disable
+    retrytotal = 2
+    retrybackoff = 0.2
+
+    # Opt-in HTTP/2: when enabled with configure_http2(), get and post go through a
+    # shared httpx client that multiplexes all requests to the same host over one
+    # TCP/TLS connection instead of queueing on per-connection keep-alives
+    http2 = False
+    _http2client = None
+
+    # (monotonic timestamp, result) of the last successful check_internet() probe.
+    # Positive results are reused for a couple of seconds so error-handling bursts
+    # (every failed request asking "is the internet down?") cost one probe, not one each.
+    _internet_cache: tuple = (0.0, False)
+    _internet_cache_ttl = 2.0
+
+    @classmethod
+    def _getsession(cls) -> requests.Session:
+        """
+        Lazily creates the shared session used for all requests
+        """
+        if cls._session is None:
+            session = requests.Session()
+            retry = Retry(total=cls.retrytotal, backoff_factor=cls.retrybackoff,
+                          status_forcelist=(502, 503, 504),
+                          allowed_methods=frozenset(["GET", "POST"]),
+                          raise_on_status=False)
+            adapter = HTTPAdapter(pool_connections=10, pool_maxsize=32, max_retries=retry)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            cls._session = session
+        return cls._session
+
+    @classmethod
+    def configure_retry(cls, total: int = 2, backoff_factor: float = 0.2) -> None:
+        """
+        Configures how transient request failures are retried.
+
+        :param total: How many times to retry a failed request. Set to 0 to disable
+            retries entirely (for latency-sensitive callers).
+        :param backoff_factor: urllib3 backoff factor between attempts
+        """
+        cls.retrytotal = total
+        cls.retrybackoff = backoff_factor
+        # Drop the current session; the next request builds one with the new policy
+        cls.close()
+
+    @classmethod
+    def configure_http2(cls, enabled: bool = True) -> None:
+        """
+        Turns the HTTP/2 request path on or off.
+        When on, get and post requests are sent through a shared httpx client with HTTP/2
+        enabled, so many requests to the same host share one multiplexed connection
+        (no head-of-line blocking between independent calls). The server must support
+        HTTP/2; httpx negotiates and falls back to HTTP/1.1 per connection if not.
+        Requires the httpx module with its h2 extra (install with pip install httpx[http2]).
+        If it is not installed, the first request logs a warning and everything falls back
+        to the regular requests session.
+
+        Note: responses on this path are httpx.Response objects. They match
+        requests.Response for the common surface (status_code, headers, text, json(),
+        content), and the stream parameter of get/post is ignored.
+
+        :param enabled: Whether to send requests over HTTP/2
+        """
+        cls.http2 = enabled
+        if not enabled and cls._http2client is not None:
+            cls._http2client.close()
+            cls._http2client = None
+
+    @classmethod
+    def _gethttp2client(cls):
+        """
+        Lazily creates the shared HTTP/2 httpx client, or returns None (disabling the
+        HTTP/2 path) if httpx / h2 are not installed
+        """
+        if cls._http2client is None:
+            try:
+                import httpx
+                cls._http2client = httpx.Client(
+                    http2=True, limits=httpx.Limits(max_keepalive_connections=16))
+            except ImportError:
+                logging.warning("HTTP/2 was enabled but the httpx module (with its h2 extra)"
+                                " is not installed - falling back to requests."
+                                " Install with pip install httpx[http2]")
+                cls.http2 = False
+                return None
+        return cls._http2client
+
+    @classmethod
+    def _storecache(cls, key: tuple, response: requests.Response) -> None:
+        """
+        Stores a response in the cache if its headers allow it, computing the expiry
+        from Cache-Control max-age or Expires. Responses with only validators
+        (ETag / Last-Modified) are stored expired, so they get revalidated with a
+        conditional request instead of refetched.
+        """
+        cachecontrol = response.headers.get("Cache-Control", "")
+        if "no-store" in cachecontrol or "private" in cachecontrol:
+            return
+        vary = response.headers.get("Vary", "")
+        if vary:
+            # The response depends on request headers; since only default-header requests
+            # are cached, Accept-Encoding (always the same on the shared session) is the
+            # one field we can safely ignore. Anything else (or "*") means don't cache.
+            varied = {field.strip().lower() for field in vary.split(",")}
+            if not varied <= {"accept-encoding"}:
+                return
+        expiry = None
+        match = _MAX_AGE_RE.search(cachecontrol)
+        if match:
+            expiry = time.monotonic() + int(match.group(1))
+        elif "Expires" in response.headers:
+            try:
+                expires = email.utils.parsedate_to_datetime(response.headers["Expires"])
+                expiry = time.monotonic() + max(0.0, (expires - datetime.now(timezone.utc)).total_seconds())
+            except (TypeError, ValueError):
+                expiry = None
+        if expiry is None and not ("ETag" in response.headers or "Last-Modified" in response.headers):
+            # Nothing to expire by and nothing to revalidate with, so don't cache at all
+            return
+        with cls._cachelock:
+            cls._cache[key] = (expiry, response)
+            cls._cache.move_to_end(key)
+            while len(cls._cache) > cls.cachemaxsize:
+                cls._cache.popitem(last=False)
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        """
+        Empties the in-memory response cache
+        """
+        with cls._cachelock:
+            cls._cache.clear()
+
+    @classmethod
+    def close(cls) -> None:
+        """
+        Closes the shared session and its pooled connections.
+        The next request will transparently create a new session.
+        """
+        if cls._session is not None:
+            cls._session.close()
+            cls._session = None
+        if cls._http2client is not None:
+            cls._http2client.close()
+            cls._http2client = None
+
+    @staticmethod
+    def get(link: str, params: Dict = None, auth: Any = None, cache: bool = True,
+            headers: Dict = None, timeout: float = 5, errormessage: str = None,
+            exceptionifbadstatuscode: bool = True, stream: bool = False) -> requests.Response:
+        """
+        Helper function to make http get request
+        If request fails, returns (None, None) or raises exception
+
+        :param link: Link to make get request to
+        :param params: Parameters to include in get request
+        :param cache: Whether to allow requests to be cached.
+                If cache is False, the header {'Cache-Control': 'no-cache'}
+                will be included in the request to disable caching.
+                If cache is True, responses are also cached in memory according to their
+                Cache-Control / Expires headers, and stale entries are revalidated with
+                conditional requests (If-None-Match / If-Modified-Since) so an unchanged
+                resource costs a 304 instead of a full refetch.
+                Only requests without auth or custom headers are cached in memory, and
+                responses marked Cache-Control: private or carrying a Vary header are
+                never stored, so credentialed or per-caller responses cannot leak
+                between callers.
+                This will not override the headers parameter if it contains a 'Cache-Control' header.
+        :param auth: Authorization to include in the request.
+            This will not override the headers parameter if it contains an 'Authorization' header.
+        :param headers: Headers to include in get request
+        :param timeout: How many seconds to wait until timing out the request
+        :param errormessage: Error message to raise if request fails or returns a
+            non-200 HTTP status code.
+            This will be bolted on to the beginning of the original error message.
+        :param exceptionifbadstatuscode: Whether to raise an exception if the request returns a non-200
+            status code
+        :param stream: Whether to stream the response body. If True, the body stays on the
+            wire until you touch response.content / response.iter_content(), which saves
+            downloading bodies you never read - but you are responsible for calling
+            response.close() when done. Streamed responses are not cached.
+        :return: response
+
+        :raises NoInternetError: No internet connection
+        :raises HttpError: Request failed
+        :raise HttpError: Request returned a non-200 HTTP status code and exceptionifbadstatuscode was True
+        """
+        link = _link_key(link)
+        if timeout <= 0:
+            timeout = None
+        if headers is None:
+            headers = {}
+        # Only anonymous, default-header requests are cached: auth or any caller-supplied
+        # header can change what the server sends back, and a cache keyed only by
+        # (link, params) would hand one caller's private response to another. Streamed
+        # responses are skipped too - their bodies are consumed by the caller
+        cacheable = cache and not stream and not auth and not headers
+        if auth:
+            headers.setdefault('Authorization', auth)
+        if not cache:
+            headers.setdefault('Cache-Control', 'no-cache')
+        cachekey = None
+        cached = None
+        if cacheable:
+            try:
+                cachekey = (link, frozenset(params.items()) if params else None)
+            except TypeError:
+                # Unhashable param values; just skip the cache for this request
+                cachekey = None
+        if cachekey is not None:
+            with RequestHandler._cachelock:
+                cached = RequestHandler._cache.get(cachekey)
+            if cached is not None:
+                expiry, cachedresponse = cached
+                if expiry is not None and time.monotonic() < expiry:
+                    logging.log(lambda: f"Returning cached response for {link}",
+                                LoggingLevel.Info, successinfo=True)
+                    return cachedresponse
+                # Stale; ask the server whether it changed instead of refetching the body
+                if "ETag" in cachedresponse.headers and 'If-None-Match' not in headers:
+                    headers['If-None-Match'] = cachedresponse.headers["ETag"]
+                if "Last-Modified" in cachedresponse.headers and 'If-Modified-Since' not in headers:
+                    headers['If-Modified-Since'] = cachedresponse.headers["Last-Modified"]
+        if logging.is_enabled(LoggingLevel.Info):
+            # Guarded so disabled logging (the default) skips all the truncation and
+            # formatting work below, not just the print
+            logmessage = f"Making HTTP get request to {link}"
+            requestdatamessage = []
+            if params:
+                requestdatamessage.append(
+                    f"params {_truncatedict(params, maxitems=3, maxlengthperitem=45, maxlinesperitem=1)}")
+            if headers:
+                requestdatamessage.append(
+                    f"headers {_truncatedict(headers, maxitems=3, maxlengthperitem=45, maxlinesperitem=1)}")
+            if requestdatamessage:
+                logmessage += f" with {_list_items(requestdatamessage)}"
+            if timeout:
+                logmessage += f" with timeout of {timeout} seconds..."
+            logging.log(logmessage, LoggingLevel.Info)
+        client = RequestHandler._gethttp2client() if RequestHandler.http2 else None
+        try:
+            if client is not None:
+                # httpx loads bodies eagerly on .get(); stream is ignored on this path
+                response = client.get(link, params=params, headers=headers, timeout=timeout)
+            else:
+                response = RequestHandler._getsession().get(link, params=params, headers=headers,
+                                                            timeout=timeout, stream=stream)
+        except Exception as e:
+            _raise_request_failed("get", link, e, errormessage)
+        if response.status_code == 304 and cached is not None:
+            # Not modified; serve the stored response and refresh its expiry
+            logging.log(lambda: f"Server confirmed cached response for {link} is still fresh",
+                        LoggingLevel.Info, successinfo=True)
+            response = cached[1]
+            RequestHandler._storecache(cachekey, response)
+            return response
+        if 200 <= response.status_code < 300:
+            if cachekey is not None:
+                RequestHandler._storecache(cachekey, response)
+            # Lazy form: the message string is only built if Info logging is actually on
+            logging.log(lambda: f"Successfully made HTTP get request to {link}",
+                        LoggingLevel.Info, successinfo=True)
+        else:
+            if exceptionifbadstatuscode:
+                _raise_http(HTTPError, errormessage,
+                            f"HTTP get request to {link} failed"
+                            f" - returned non-200 http status code ({response.status_code})")
+            else:
+                logging.log(lambda: f"HTTP get request to {link} failed"
+                                    f" - returned non-200 http status code ({response.status_code})",
+                            LoggingLevel.Info, successinfo=True)
+        return response
+
+    @staticmethod
+    def post(link: str, data: Any = None, contenttype: str = None, json: Dict = None,
+             auth: Any = None, headers: Dict = None, timeout: float = 5, errormessage: str = None,
+             exceptionifbadstatuscode: bool = True, stream: bool = False) -> requests.Response:
+        """
+        Helper function to make http post request
+        If request fails, returns (None, None) or raises exception
+
+        :param link: Link to make post request to
+        :param data: Body of post request. For an empty body, set it to None or don't supply anything for it.
+            Make sure contenttype matches the type of this data.
+        :param contenttype: The content type of the data, like 'text/plain' or 'application/json'.
+            Automatically detects json and string. If body is empty, contenttype will not be used.
+            This will not override the headers parameter if it contains a 'Content-Type' header.
+        :param json: Json data to include in the post request.
+        :param auth: Authorization to include in the request.
+            This will not override the headers parameter if it contains an 'Authorization' header.
+        :param headers: Headers to include in post request.
+        :param timeout: How many seconds to wait until timing out the request
+        :param errormessage: Error message to raise if request fails or returns a
+            non-200 HTTP status code.
+            This will be bolted on to the beginning of the original error message.
+        :param exceptionifbadstatuscode: Whether to raise an exception if the request returns a non-200
+            status code
+        :param stream: Whether to stream the response body. If True, the body stays on the
+            wire until you touch response.content / response.iter_content(), which saves
+            downloading bodies you never read - but you are responsible for calling
+            response.close() when done.
+        :return: response
+
+        :raises ValueError: contenttype parameter was not supplied, 'Content-Type' header was not supplied,
+            and content type could not be automatically detected.
+        :raises NoInternetError: No internet connection
+        :raises HttpError: Request failed
+        :raise HttpError: Request returned a non-200 HTTP status code and exceptionifbadstatuscode was True
+        """
+        link = _link_key(link)
+        if timeout <= 0:
+            timeout = None
+        if headers is None:
+            headers = {}
+        if data is not None and 'Content-Type' not in headers:
+            if not contenttype:
+                if isinstance(data, str):
+                    contenttype = "text/plain"
+                elif isinstance(data, dict):
+                    contenttype = "application/json"
+                else:
+                    raise ValueError(f"Failed to make http post request to {link}: Could not determine content type of"
+                                     f" data, which is of type {type(data).__name__}. Please manually"
+                                     f" supply the content type using the contenttype parameter.")
+                if logging.is_enabled(LoggingLevel.Info):
+                    logging.log("Automatically detected content type of data"
+                                f" \"{_truncatestring(str(data), maxlength=100, maxlines=1)}\": {contenttype}")
+            headers["Content-Type"] = contenttype
+        if isinstance(data, dict) and headers.get("Content-Type", "").startswith("application/json"):
+            # requests/httpx form-encode a dict passed as the body, which would contradict
+            # the JSON content type we just declared - serialize it ourselves
+            data = _json.dumps(data)
+        if auth:
+            headers.setdefault('Authorization', auth)
+        if logging.is_enabled(LoggingLevel.Info):
+            # Guarded so disabled logging (the default) skips all the truncation and
+            # formatting work below, not just the print
+            logmessage = f"Making HTTP post request to {link}"
+            requestdatamessage = []
+            if data is not None:
+                requestdatamessage.append(f"data \"{_truncatestring(str(data), maxlength=100, maxlines=1)}\""
+                                          f" of content type {headers['Content-Type']}")
+            else:
+                requestdatamessage.append("empty body")
+            if json:
+                requestdatamessage.append(
+                    f"json {_truncatedict(json, maxitems=3, maxlengthperitem=45, maxlinesperitem=1)}")
+            if headers:
+                requestdatamessage.append(
+                    f"headers {_truncatedict(headers, maxitems=3, maxlengthperitem=45, maxlinesperitem=1)}")
+            if requestdatamessage:
+                logmessage += f" with {_list_items(requestdatamessage)}"
+            if timeout:
+                logmessage += f" with timeout of {timeout} seconds..."
+            logging.log(logmessage, LoggingLevel.Info)
+        client = RequestHandler._gethttp2client() if RequestHandler.http2 else None
+        try:
+            if client is not None:
+                # httpx takes raw string/bytes bodies as content=, not data=
+                bodykwargs = ({"content": data} if isinstance(data, (str, bytes))
+                              else {"data": data} if data is not None else {})
+                response = client.post(link, json=json, headers=headers, timeout=timeout, **bodykwargs)
+            else:
+                response = RequestHandler._getsession().post(link, data=data, json=json, headers=headers,
+                                                             timeout=timeout, stream=stream)
+        except Exception as e:
+            _raise_request_failed("post", link, e, errormessage)
+        if 200 <= response.status_code < 300:
+            # Lazy form: the message string is only built if Info logging is actually on
+            logging.log(lambda: f"Successfully made HTTP post request to {link}",
+                        LoggingLevel.Info, successinfo=True)
+        else:
+            if exceptionifbadstatuscode:
+                _raise_http(HTTPError, errormessage,
+                            f"HTTP post request to {link} failed"
+                            f" - returned non-200 http status code ({response.status_code})")
+            else:
+                logging.log(lambda: f"HTTP post request to {link} failed"
+                                    f" - returned non-200 http status code ({response.status_code})",
+                            LoggingLevel.Info, successinfo=True)
+        return response
+
+    @classmethod
+    def get_many(cls, links: Sequence[str], headers: Dict = None, timeout: float = 5,
+                 concurrency: int = 32, errormessage: str = None,
+                 exceptionifbadstatuscode: bool = True) -> list:
+        """
+        Helper function to make many http get requests concurrently
+        The requests share one connection pool and overlap their network wait time,
+        so a batch takes about as long as its slowest request instead of the sum.
+        Requires the httpx module (install with pip install httpx).
+
+        :param links: Links to make get requests to
+        :param headers: Headers to include in every get request
+        :param timeout: How many seconds to wait until timing out each request
+        :param concurrency: Maximum amount of requests in flight at once
+        :param errormessage: Error message to raise if a request fails or returns a
+            non-200 HTTP status code.
+            This will be bolted on to the beginning of the original error message.
+        :param exceptionifbadstatuscode: Whether to raise an exception if a request returns a non-200
+            status code
+        :return: List of responses, in the same order as links
+
+        :raises ImportError: The httpx module is not installed
+        :raises HttpError: A request failed
+        :raise HttpError: A request returned a non-200 HTTP status code and exceptionifbadstatuscode was True
+        """
+        return asyncio.run(cls._get_many(links, headers, timeout, concurrency, errormessage,
+                                         exceptionifbadstatuscode))
+
+    @classmethod
+    async def _get_many(cls, links: Sequence[str], headers: Dict, timeout: float, concurrency: int,
+                        errormessage: str, exceptionifbadstatuscode: bool) -> list:
+        try:
+            import httpx
+        except ImportError:
+            raise ImportError("RequestHandler.get_many() requires the httpx module"
+                              " - install with pip install httpx") from None
+        if timeout <= 0:
+            timeout = None
+        logging.log(f"Making {len(links)} concurrent HTTP get requests"
+                    f" with concurrency limit of {concurrency}...", LoggingLevel.Info)
+        semaphore = asyncio.Semaphore(concurrency)
+        limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+        async def fetch(link: str) -> Any:
+            async with semaphore:
+                try:
+                    return await client.get(link, headers=headers)
+                except (httpx.ConnectError, httpx.ConnectTimeout):
+                    # Same classification get() does for requests.ConnectionError
+                    _raise_http(NoInternetError, errormessage,
+                                f"HTTP get request to {link} failed - could not establish a connection"
+                                " (no internet connection?)")
+                except Exception as e:
+                    _raise_http(HTTPError, errormessage, f"HTTP get request to {link} failed - {e}")
+
+        async with httpx.AsyncClient(limits=limits, timeout=timeout) as client:
+            responses = await asyncio.gather(*(fetch(link) for link in links))
+        for link, response in zip(links, responses):
+            if 200 <= response.status_code < 300:
+                continue
+            if exceptionifbadstatuscode:
+                _raise_http(HTTPError, errormessage,
+                            f"HTTP get request to {link} failed"
+                            f" - returned non-200 http status code ({response.status_code})")
+            else:
+                logging.log(f"HTTP get request to {link} failed"
+                            f" - returned non-200 http status code ({response.status_code})",
+                            LoggingLevel.Info, successinfo=True)
+        logging.log(f"Successfully made {len(links)} concurrent HTTP get requests",
+                    LoggingLevel.Info, successinfo=True)
+        return list(responses)
+
+    @classmethod
+    def check_internet(cls, testhost: tuple = ("1.1.1.1", 53), timeout: float = 5) -> bool:
+        """
+        Checks that there is an internet connection with a bare TCP connection to a
+        well-known resolver - no DNS lookup, TLS handshake, or HTTP round trip involved,
+        so it is much cheaper than fetching a page. Use check_internet_http() if you need
+        to validate full HTTPS egress (for example to detect captive portals).
+
+        A positive result is cached for a couple of seconds, so calling this from every
+        error handler during a burst of failures only probes the network once.
+
+        :param testhost: (host, port) to open the test connection to
+        :param timeout: Timeout for the connection. If the timeout is exceeded, the internet
+            connection check will fail.
+        :return: Whether there is an internet connection
+        """
+        now = time.monotonic()
+        ts, ok = cls._internet_cache
+        if ok and now - ts < cls._internet_cache_ttl:
+            return True
+        if timeout is not None and timeout <= 0:
+            timeout = None
+        if timeout:
+            logging.log(f"Checking for internet connection with timeout of {timeout} seconds...",
+                        LoggingLevel.Info)
+        else:
+            logging.log("Checking for internet connection...", LoggingLevel.Info)
+        logging.log(f"Using TCP connection to {testhost[0]}:{testhost[1]} to check for internet connection",
+                    LoggingLevel.Debug)
+        try:
+            socket.create_connection(testhost, timeout=timeout).close()
+        except OSError:
+            return False
+        cls._internet_cache = (now, True)
+        logging.log("Successfully confirmed internet connection!", LoggingLevel.Info, successinfo=True)
+        return True
+
+    @staticmethod
+    def check_internet_http(testurl: str = "https://www.example.com", timeout: float = 5) -> bool:
+        """
+        Checks that there is an internet connection by making a full HTTP get request.
+        Slower than check_internet(), but validates HTTPS egress end to end.
+
+        :param testurl: URL to make request to
+        :param timeout: Timeout for request. If the timeout is exceeded, the internet connection check will fail.
+        :return: Whether there is an internet connection
+        """
+        if timeout:
+            logging.log(f"Checking for internet connection with timeout of {timeout} seconds...",
+                        LoggingLevel.Info)
+        else:
+            logging.log("Checking for internet connection...", LoggingLevel.Info)
+        logging.log(f"Using {testurl} to check for internet connection", LoggingLevel.Debug)
+        try:
+            # Streamed so we never download the body; the status line is all we need
+            response = RequestHandler.get(testurl, timeout=timeout, stream=True,
+                                          errormessage="Failed to check for internet connection")
+        except HTTPError:
+            return False
+        else:
+            response.close()
+            logging.log(f"Successfully confirmed internet connection!", LoggingLevel.Info, successinfo=True)
+            return True
+
+    @classmethod
+    def assert_internet(cls, testhost: tuple = ("1.1.1.1", 53), timeout: float = 5) -> None:
+        """
+        Asserts that there is an internet connection.
+
+        :param testhost: (host, port) to open the test connection to
+        :param timeout: Timeout for the connection. If the timeout is exceeded, the internet
+            connection check will fail.
+
+        :raises NoInternetError: No internet connection
+        """
+        if not cls.check_internet(testhost, timeout):
+            raise NoInternetError("No internet connection")
+
+
+# Make our own instance of logging
+logging = Logging(usedefaults=True)
+
+
+def enable_logging():
+    """
+    Enables logging to the console with print statements
+    """
+    logging.enable()
+
+
+def disable_logging():
+    """
+    Enables logging to the console with print statements
+    """
+    logging.disable()
+
+
+disable_logging()